@@ -12,16 +12,29 @@ Targets:
     - apps/mobile/android/app/fastlane/metadata/  (numbered, for stores)
 """
 
-import filecmp
+import errno
+import hashlib
+import json
+import os
 import shutil
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 
+if sys.platform.startswith("linux"):
+    import fcntl
+
+    # From <linux/fs.h>; not exposed by the fcntl module.
+    FICLONE = 0x40049409
+
 REPO_ROOT = Path(__file__).resolve().parent.parent
 
-SRC = REPO_ROOT / "screenshots" / "mobile" / "original"
-DOCS = REPO_ROOT / "apps" / "docs" / "static" / "img" / "screenshots"
-STORE = REPO_ROOT / "fastlane" / "metadata" / "android" / "en-US" / "images" / "phoneScreenshots"
+SRC = Path(os.path.join(REPO_ROOT, "screenshots", "mobile", "original"))
+DOCS = Path(os.path.join(REPO_ROOT, "apps", "docs", "static", "img", "screenshots"))
+STORE = Path(os.path.join(REPO_ROOT, "fastlane", "metadata", "android", "en-US", "images", "phoneScreenshots"))
+# Digests of the last synced content per target, kept out of the published docs tree
+CACHE = REPO_ROOT / "screenshots" / ".sync-cache.json"
 
 STORE_ORDER = [
     "Dashboard.png",
@@ -34,6 +47,131 @@ STORE_ORDER = [
     "DarkMode.png",
 ]
 
+COPY_BUFSIZE = 1024 * 1024
+
+def file_digest(path: Path) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    with path.open("rb") as f:
+        while chunk := f.read(COPY_BUFSIZE):
+            h.update(chunk)
+    return h.hexdigest()
+
+def _source_digest(path: Path):
+    try:
+        return file_digest(path)
+    except OSError:
+        # Leave it to the copy attempt to report the error for this file
+        return None
+
+def load_digests() -> dict:
+    try:
+        data = json.loads(CACHE.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return {}
+    # A corrupt or foreign cache just means nothing is cached
+    return data if isinstance(data, dict) else {}
+
+def _cache_key(dst: Path) -> str:
+    return dst.relative_to(REPO_ROOT).as_posix()
+
+def _digest_entry(digest: str, st) -> dict:
+    return {"digest": digest, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+def _cached_digest(digests: dict, key: str, st):
+    entry = digests.get(key)
+    if isinstance(entry, dict) and (entry.get("size"), entry.get("mtime_ns")) == (st.st_size, st.st_mtime_ns):
+        return entry.get("digest")
+    return None
+
+def needs_hash(src_stat, dst_stat) -> bool:
+    """Whether size and mtime alone cannot tell if two files are equal."""
+    return src_stat.st_size == dst_stat.st_size and src_stat.st_mtime_ns != dst_stat.st_mtime_ns
+
+def files_equal(dst: Path, src_stat, dst_stat, src_digest, digests: dict) -> bool:
+    """Compare by size and mtime first, falling back to content hashes.
+
+    src_digest is only used when needs_hash() is true. digests maps a
+    target to the digest of its content as last seen, along with the
+    target's size and mtime at the time. The cached digest stands in for
+    hashing dst only while that stat still matches.
+    """
+    if src_stat.st_size != dst_stat.st_size:
+        return False
+    if src_stat.st_mtime_ns == dst_stat.st_mtime_ns:
+        return True
+    key = _cache_key(dst)
+    dst_digest = _cached_digest(digests, key, dst_stat)
+    if dst_digest is None:
+        # dst changed since it was last seen (or was never recorded)
+        dst_digest = file_digest(dst)
+        digests[key] = _digest_entry(dst_digest, dst_stat)
+    return dst_digest == src_digest
+
+def _sendfile(fsrc, fdst):
+    offset = 0
+    while sent := os.sendfile(fdst.fileno(), fsrc.fileno(), offset, 2**30):
+        offset += sent
+
+def _copy_chunks(fsrc, fdst):
+    mv = memoryview(bytearray(COPY_BUFSIZE))
+    while n := fsrc.readinto(mv):
+        fdst.write(mv[:n])
+
+def fast_copy(src: Path, dst: Path):
+    """Copy src to dst, keeping the data in the kernel where possible.
+
+    On Linux tries a reflink (FICLONE) first, then sendfile, and falls back
+    to a 1 MiB readinto loop if the filesystem supports neither. Other
+    platforms use shutil.copyfile and its native fast paths. Metadata is
+    copied like shutil.copy2.
+    """
+    if sys.platform.startswith("linux"):
+        with src.open("rb") as fsrc, dst.open("wb") as fdst:
+            try:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            except OSError as e:
+                if e.errno not in (errno.EOPNOTSUPP, errno.EXDEV, errno.EINVAL, errno.ENOTTY):
+                    raise
+                try:
+                    _sendfile(fsrc, fdst)
+                except OSError as e:
+                    # Some FUSE and network filesystems reject sendfile
+                    if e.errno not in (errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP):
+                        raise
+                    fsrc.seek(0)
+                    fdst.seek(0)
+                    fdst.truncate()
+                    _copy_chunks(fsrc, fdst)
+    else:
+        shutil.copyfile(src, dst)
+    shutil.copystat(src, dst)
+
+def _name_key(name: str) -> str:
+    """Index key for a file name; Windows file names are case-insensitive."""
+    return name.casefold() if sys.platform == "win32" else name
+
+def _sync_one(job, src_digests, digests):
+    """Sync a single file. Returns (message, copied, failed)."""
+    src_entry, dst, dst_entry, label, unchanged_label = job
+    try:
+        copied = _sync_file(src_entry, dst, dst_entry, src_digests.get(src_entry.name), digests)
+    except OSError as e:
+        return f"Error: {label} failed: {e}", False, True
+    return (label if copied else unchanged_label), copied, False
+
+def _sync_file(src_entry, dst, dst_entry, src_digest, digests) -> bool:
+    """Copy a source to dst unless it is already up to date. Returns whether it copied."""
+    src = Path(src_entry.path)
+    # DirEntry caches its stat, so a source shared by both targets is stat'd once
+    if dst_entry is not None and dst_entry.is_file() and files_equal(
+        dst, src_entry.stat(), dst_entry.stat(), src_digest, digests
+    ):
+        return False
+    fast_copy(src, dst)
+    # copystat gives dst the source mtime, so the next run needs no digest
+    digests.pop(_cache_key(dst), None)
+    return True
+
 def main():
     if not SRC.is_dir():
         print(f"Error: Source directory not found: {SRC}")
@@ -44,41 +182,87 @@ def main():
     print("================================")
     print()
 
-    # Sync to docs (named copies)
     DOCS.mkdir(parents=True, exist_ok=True)
+    STORE.mkdir(parents=True, exist_ok=True)
 
-    print("Docs (named):")
-    for file in sorted(SRC.glob("*.png")):
-        dest = DOCS / file.name
-        if dest.is_file() and filecmp.cmp(file, dest, shallow=False):
-            print(f"  {file.name} (unchanged)")
-            continue
-        shutil.copy2(file, dest)
-        print(f"  {file.name} -> docs")
+    # One directory listing per directory instead of a stat per file
+    src_entries = {_name_key(e.name): e for e in os.scandir(SRC) if e.name.lower().endswith(".png")}
+    docs_index = {_name_key(e.name): e for e in os.scandir(DOCS)}
+    store_index = {_name_key(e.name): e for e in os.scandir(STORE)}
 
-    # Sync to Fastlane store metadata (numbered copies)
-    print()
-    STORE.mkdir(parents=True, exist_ok=True)
+    # Docs get named copies, Fastlane store metadata gets numbered copies
+    docs_jobs = [
+        (
+            entry,
+            DOCS / entry.name,
+            docs_index.get(_name_key(entry.name)),
+            f"{entry.name} -> docs",
+            f"{entry.name} (unchanged)",
+        )
+        for entry in sorted(src_entries.values(), key=lambda e: _name_key(e.name))
+    ]
+    store_jobs = [
+        (
+            src_entries[_name_key(name)],
+            STORE / f"{i}.png",
+            store_index.get(_name_key(f"{i}.png")),
+            f"{name} -> {i}.png",
+            f"{name} -> {i}.png (unchanged)",
+        )
+        for i, name in enumerate(STORE_ORDER, start=1)
+        if _name_key(name) in src_entries
+    ]
 
-    print("Fastlane (numbered):")
-    count = 0
-    for i, name in enumerate(STORE_ORDER, start=1):
-        src_file = SRC / name
-        if not src_file.is_file():
-            print(f"  Warning: {name} not found in source - skipping.")
-            continue
-        dest_file = STORE / f"{i}.png"
-        if dest_file.is_file() and filecmp.cmp(src_file, dest_file, shallow=False):
-            print(f"  {name} -> {i}.png (unchanged)")
+    jobs = docs_jobs + store_jobs
+    # Sources shared by docs and Fastlane are hashed once, and only when a
+    # target's size and mtime cannot settle the comparison
+    to_hash = {
+        src_entry.name: Path(src_entry.path)
+        for src_entry, _, dst_entry, _, _ in jobs
+        if dst_entry is not None and dst_entry.is_file() and needs_hash(src_entry.stat(), dst_entry.stat())
+    }
+
+    digests = load_digests()
+    # Entries for targets this run no longer syncs are dropped
+    targets = {_cache_key(dst) for _, dst, _, _, _ in jobs}
+    synced_digests = {key: entry for key, entry in digests.items() if key in targets}
+
+    sys.stdout.write("Docs (named):\n")
+    sys.stdout.flush()
+
+    # File I/O releases the GIL, so copies overlap well across threads.
+    # map() keeps results in submission order for deterministic output.
+    with ThreadPoolExecutor(max_workers=min(8, (os.cpu_count() or 1) * 2)) as pool:
+        src_digests = dict(zip(to_hash, pool.map(_source_digest, to_hash.values())))
+        results = list(pool.map(partial(_sync_one, src_digests=src_digests, digests=synced_digests), jobs))
+    if synced_digests != digests:
+        CACHE.write_text(json.dumps(synced_digests, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    docs_results = results[:len(docs_jobs)]
+    store_results = results[len(docs_jobs):]
+
+    lines = [f"  {message}" for message, _, _ in docs_results]
+    sys.stdout.write("\n".join(lines) + "\n")
+
+    lines = ["", "Fastlane (numbered):"]
+    store_iter = iter(store_results)
+    for name in STORE_ORDER:
+        if _name_key(name) not in src_entries:
+            lines.append(f"  Warning: {name} not found in source - skipping.")
             continue
-        shutil.copy2(src_file, dest_file)
-        print(f"  {name} -> {i}.png")
-        count += 1
+        message, _, _ = next(store_iter)
+        lines.append(f"  {message}")
+    sys.stdout.write("\n".join(lines) + "\n")
+    count = sum(copied for _, copied, _ in store_results)
+    failed = sum(failed for _, _, failed in results)
 
     print()
     print("================================")
     print(f"Done. {count} screenshots synced.")
+    if failed:
+        print(f"{failed} screenshots failed to sync.")
     print()
+    if failed:
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()